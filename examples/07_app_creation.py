@@ -1,4 +1,3 @@
-import asyncio
 import tempfile
 from pathlib import Path
 
@@ -6,35 +5,11 @@ from mini_agent import LLMClient, LLMProvider
 from mini_agent.agent import Agent
 from mini_agent.config import Config
 from mini_agent.tools import BashTool, EditTool, ReadTool, WriteTool
+from mini_agent.utils.async_utils import run_async
 
 workspace_dir = '/Users/loui/test/mac-app'
 
-async def app_creation():
-    """Demo: Agent creates app based on user request."""
-    print("\n" + "=" * 60)
-    print("Demo: Agent-Driven App Creation")
-    print("=" * 60)
-
-    # Load configuration
-    config_path = Path("mini_agent/config/config.yaml")
-    if not config_path.exists():
-        print("❌ config.yaml not found. Please set up your API key first.")
-        print("   Run: cp mini_agent/config/config-example.yaml mini_agent/config/config.yaml")
-        return
-
-    config = Config.from_yaml(config_path)
-
-    # Check API key
-    if not config.llm.api_key or config.llm.api_key.startswith("YOUR_"):
-        print("❌ API key not configured in config.yaml")
-        return
-
-    # Create temporary workspace
-    #with tempfile.TemporaryDirectory() as workspace_dir:
-    print(f"📁 Workspace: {workspace_dir}\n")
-
-
-    system_prompt = """
+SYSTEM_PROMPT = """
 You are Mini-Agent, a versatile AI assistant powered by MiniMax, specialized in building cross-platform desktop applications with a focus on macOS using React, Vite, Next.js, Tauri, and Rust.
 
 Core Capabilities
@@ -87,12 +62,39 @@ Use Skills: Leverage tauri_setup and react_development skills for boilerplate pa
 Workspace Context
 You are working in a workspace directory. All operations are relative to this context unless absolute paths are specified. macOS is the target operating system."""
 
+
+async def app_creation():
+    """Demo: Agent creates app based on user request."""
+    print("\n" + "=" * 60)
+    print("Demo: Agent-Driven App Creation")
+    print("=" * 60)
+
+    # Load configuration
+    config_path = Path("mini_agent/config/config.yaml")
+    if not config_path.exists():
+        print("❌ config.yaml not found. Please set up your API key first.")
+        print("   Run: cp mini_agent/config/config-example.yaml mini_agent/config/config.yaml")
+        return
+
+    config = Config.from_yaml(config_path)
+
+    # Check API key
+    if not config.llm.api_key or config.llm.api_key.startswith("YOUR_"):
+        print("❌ API key not configured in config.yaml")
+        return
+
+    # Create temporary workspace
+    #with tempfile.TemporaryDirectory() as workspace_dir:
+    print(f"📁 Workspace: {workspace_dir}\n")
+
     # Initialize LLM client
     llm_client = LLMClient(
         api_key=config.llm.api_key,
         provider=config.llm.provider or LLMProvider.OPENAI,
         api_base=config.llm.api_base,
         model=config.llm.model,
+        # Anthropic's own API supports prompt caching; other endpoints opt in via config
+        prompt_caching=config.llm.prompt_caching or "api.anthropic.com" in config.llm.api_base,
     )
 
     # Initialize tools
@@ -106,9 +108,9 @@ You are working in a workspace directory. All operations are relative to this co
     # Create agent
     agent = Agent(
         llm_client=llm_client,
-        system_prompt=system_prompt,
+        system_prompt=SYSTEM_PROMPT,
         tools=tools,
-        max_steps=100,
+        max_steps=config.agent.max_steps,
         workspace_dir=workspace_dir,
     )
 
@@ -152,4 +154,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
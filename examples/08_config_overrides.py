@@ -5,10 +5,27 @@ Demonstrates various ways to use the runtime override system.
 """
 
 import asyncio
+import contextlib
+import io
+import os
+import sys
 from pathlib import Path
 from mini_agent import LLMClient, Agent
 from mini_agent.config import Config
 from mini_agent.tools import ReadTool, WriteTool, BashTool
+from mini_agent.utils.async_utils import run_async
+
+
+@contextlib.contextmanager
+def buffered_output():
+    """Collect everything printed inside the block and write it out in one go."""
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            yield
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
 
 def example_1_basic_overrides():
@@ -70,15 +87,15 @@ def example_3_env_simulation():
     print("Example 3: Environment variable overrides")
     print("=" * 60)
 
-    import os
-    from mini_agent.config_override import ConfigOverride
-
-    # Set environment variables
-    os.environ["MINI_AGENT_MODEL"] = "gpt-3.5-turbo"
-    os.environ["MINI_AGENT_MAX_STEPS"] = "150"
-    os.environ["MINI_AGENT_MAX_RETRIES"] = "10"
+    # Snapshot the environment so cleanup restores it exactly
+    saved_env = os.environ.copy()
 
     try:
+        # Set environment variables
+        os.environ["MINI_AGENT_MODEL"] = "gpt-3.5-turbo"
+        os.environ["MINI_AGENT_MAX_STEPS"] = "150"
+        os.environ["MINI_AGENT_MAX_RETRIES"] = "10"
+
         config = Config.load_with_overrides(verbose=True)
 
         print(f"\nModel: {config.llm.model}")
@@ -86,9 +103,8 @@ def example_3_env_simulation():
         print(f"Max retries: {config.llm.retry.max_retries}")
     finally:
         # Cleanup
-        del os.environ["MINI_AGENT_MODEL"]
-        del os.environ["MAX_STEPS"]
-        del os.environ["MAX_RETRIES"]
+        os.environ.clear()
+        os.environ.update(saved_env)
 
 
 def example_4_combined():
@@ -110,7 +126,7 @@ tools:
     override_path.write_text(override_content)
 
     # Environment variables
-    import os
+    saved_env = os.environ.copy()
     os.environ["MINI_AGENT_MAX_STEPS"] = "250"
 
     # CLI args
@@ -134,7 +150,8 @@ tools:
 
     finally:
         override_path.unlink()
-        del os.environ["MINI_AGENT_MAX_STEPS"]
+        os.environ.clear()
+        os.environ.update(saved_env)
 
 
 async def example_5_practical_use():
@@ -143,8 +160,10 @@ async def example_5_practical_use():
     print("Example 5: Practical Agent usage with overrides")
     print("=" * 60)
 
-    # Load config with overrides
-    config = Config.load_with_overrides(
+    # Load config with overrides (file IO runs in a worker thread so the
+    # event loop is not blocked)
+    config = await asyncio.to_thread(
+        Config.load_with_overrides,
         cli_args={
             "llm.model": "gpt-3.5-turbo",  # Use cheaper model for testing
             "agent.max_steps": 10,  # Limit steps for quick test
@@ -208,7 +227,7 @@ llm:
     override_path = Path("test-priority-override.yaml")
     override_path.write_text(override_content)
 
-    import os
+    saved_env = os.environ.copy()
     os.environ["MINI_AGENT_MODEL"] = "gpt-3.5-turbo"
 
     try:
@@ -227,7 +246,8 @@ llm:
 
     finally:
         override_path.unlink()
-        del os.environ["MINI_AGENT_MODEL"]
+        os.environ.clear()
+        os.environ.update(saved_env)
 
 
 def main():
@@ -237,16 +257,20 @@ def main():
     print("\n" + "🎯 " * 15 + "\n")
 
     # Run synchronous examples
-    example_1_basic_overrides()
-    example_2_override_file()
-    example_3_env_simulation()
-    example_4_combined()
-
-    # Run priority demonstration
-    example_6_priority_demonstration()
+    for example in (
+        example_1_basic_overrides,
+        example_2_override_file,
+        example_3_env_simulation,
+        example_4_combined,
+        # Run priority demonstration
+        example_6_priority_demonstration,
+    ):
+        with buffered_output():
+            example()
 
     # Run async example
-    asyncio.run(example_5_practical_use())
+    with buffered_output():
+        run_async(example_5_practical_use())
 
     print("\n" + "=" * 60)
     print("All examples completed!")
@@ -1,11 +1,48 @@
 """Test script to demonstrate ESC key interrupt functionality.
 
 This script shows how to use the ESC key to interrupt agent execution.
+The agent loop itself does not poll the keyboard, so the script watches
+for ESC alongside the run and cancels the agent task when it is pressed.
 """
 
 import asyncio
-from mini_agent import Agent, LLMClient
-from mini_agent.tools import ReadFile, WriteFile
+from mini_agent import Agent, LLMResponse
+from mini_agent.schema import FunctionCall, ToolCall
+from mini_agent.tools import ReadTool, WriteTool
+from mini_agent.utils.async_utils import run_async
+from mini_agent.utils.keyboard_utils import is_esc_pressed, start_keyboard_listener, stop_keyboard_listener
+
+
+class _NoopLLM:
+    """Stand-in LLM client that requests a cheap tool call on every step.
+
+    Because each response carries a tool call, the agent keeps looping until
+    it reaches ``max_steps`` (or is interrupted) without any API call.
+    """
+
+    retry_callback = None
+
+    def __init__(self):
+        self._calls = 0
+
+    async def generate(self, messages, tools=None) -> LLMResponse:
+        await asyncio.sleep(0.1)
+        self._calls += 1
+        tool_call = ToolCall(
+            id=f"call_{self._calls}",
+            type="function",
+            function=FunctionCall(name="read_file", arguments={"path": "missing.txt"}),
+        )
+        return LLMResponse(content="", tool_calls=[tool_call], finish_reason="tool_use")
+
+
+async def _watch_for_esc(task: asyncio.Task) -> None:
+    """Cancel the agent task as soon as ESC is pressed."""
+    while not task.done():
+        if is_esc_pressed():
+            task.cancel()
+            return
+        await asyncio.sleep(0.05)
 
 
 async def test_esc_interrupt():
@@ -13,25 +50,34 @@ async def test_esc_interrupt():
     print("=" * 60)
     print("ESC Key Interrupt Test")
     print("=" * 60)
-    print("\nThis test will run for 50 steps. Press ESC at any time to interrupt.")
-    print("The agent will stop gracefully and return an interruption message.\n")
+    print("\nThis test runs the agent for up to 50 steps. Press ESC at any time to interrupt.")
+    print("The agent task is cancelled and an interruption message is shown.\n")
 
-    # Create a simple LLM client (using a mock or placeholder)
+    # Use a no-op LLM client so no API key or network access is needed
     # In a real scenario, you would create a proper LLMClient
     print("Note: Using a mock LLM client for demonstration.")
     print("Press ESC anytime to interrupt the test...\n")
 
     # Create agent with tools
     agent = Agent(
-        llm_client=None,  # Would be a real LLM client in production
+        llm_client=_NoopLLM(),  # Would be a real LLM client in production
         system_prompt="You are a helpful assistant that responds briefly.",
-        tools=[ReadFile(), WriteFile()],
+        tools=[ReadTool(workspace_dir="./test_workspace"), WriteTool(workspace_dir="./test_workspace")],
         max_steps=50,
         workspace_dir="./test_workspace"
     )
 
-    # Run the agent
-    result = await agent.run()
+    # Run the agent while watching for ESC
+    start_keyboard_listener()
+    task = asyncio.create_task(agent.run())
+    watcher = asyncio.create_task(_watch_for_esc(task))
+    try:
+        result = await task
+    except asyncio.CancelledError:
+        result = "Interrupted by ESC."
+    finally:
+        watcher.cancel()
+        stop_keyboard_listener()
 
     print("\n" + "=" * 60)
     print("Result:")
@@ -40,4 +86,4 @@ async def test_esc_interrupt():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_esc_interrupt())
+    run_async(test_esc_interrupt())
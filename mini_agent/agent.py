@@ -3,9 +3,8 @@
 import json
 from pathlib import Path
 
-import tiktoken
-
 from .llm import LLMClient
+from .utils.token_utils import count_tokens, get_encoding
 from .logger import AgentLogger
 from .schema import Message
 from .tools.base import Tool, ToolResult
@@ -89,7 +88,7 @@ class Agent:
         """
         try:
             # Use cl100k_base encoder (used by GPT-4 and most modern models)
-            encoding = tiktoken.get_encoding("cl100k_base")
+            get_encoding()
         except Exception:
             # Fallback: if tiktoken initialization fails, use simple estimation
             return self._estimate_tokens_fallback()
@@ -99,20 +98,20 @@ class Agent:
         for msg in self.messages:
             # Count text content
             if isinstance(msg.content, str):
-                total_tokens += len(encoding.encode(msg.content, disallowed_special=()))
+                total_tokens += count_tokens(msg.content)
             elif isinstance(msg.content, list):
                 for block in msg.content:
                     if isinstance(block, dict):
                         # Convert dict to string for calculation
-                        total_tokens += len(encoding.encode(str(block), disallowed_special=()))
+                        total_tokens += count_tokens(str(block))
 
             # Count thinking
             if msg.thinking:
-                total_tokens += len(encoding.encode(msg.thinking, disallowed_special=()))
+                total_tokens += count_tokens(msg.thinking)
 
             # Count tool_calls
             if msg.tool_calls:
-                total_tokens += len(encoding.encode(str(msg.tool_calls), disallowed_special=()))
+                total_tokens += count_tokens(str(msg.tool_calls))
 
             # Metadata overhead per message (approximately 4 tokens)
             total_tokens += 4
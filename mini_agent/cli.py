@@ -478,6 +478,7 @@ async def run_agent(workspace_dir: Path, args: argparse.Namespace):
         retry_config=retry_config if config.llm.retry.enabled else None,
         model_context_limit=config.llm.model_context_limit,
         context_safety_margin=config.llm.context_safety_margin,
+        prompt_caching=config.llm.prompt_caching,
     )
 
     # Set retry callback
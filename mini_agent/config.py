@@ -33,6 +33,8 @@ class LLMConfig(BaseModel):
     # Context window configuration
     model_context_limit: int | None = None  # e.g. 65536
     context_safety_margin: int = 512
+    # Mark the system prompt cacheable (Anthropic prompt caching; anthropic provider only)
+    prompt_caching: bool = False
 
 
 class AgentConfig(BaseModel):
@@ -79,10 +81,19 @@ class Config(BaseModel):
     @classmethod
     def load(cls) -> "Config":
         """Load configuration from the default search path (without overrides)."""
+        return cls.model_validate(cls.load_raw())
+
+    @classmethod
+    def load_raw(cls) -> Dict[str, Any]:
+        """Load the default config file as a nested dict, before validation.
+
+        The dict has the same shape as ``Config.model_dump()``, so overrides can
+        be merged into it and validated once with ``Config.model_validate``.
+        """
         config_path = cls.get_default_config_path()
         if not config_path.exists():
             raise FileNotFoundError("Configuration file not found. Run scripts/setup-config.sh or place config.yaml in mini_agent/config/.")
-        return cls.from_yaml(config_path)
+        return cls._read_yaml_dict(config_path)
 
     @classmethod
     def load_with_overrides(
@@ -153,6 +164,22 @@ class Config(BaseModel):
         Returns:
             Config instance
 
+        Raises:
+            FileNotFoundError: Configuration file does not exist
+            ValueError: Invalid configuration format or missing required fields
+        """
+        return cls.model_validate(cls._read_yaml_dict(config_path))
+
+    @staticmethod
+    def _read_yaml_dict(config_path: str | Path) -> Dict[str, Any]:
+        """Read a YAML config file into a nested dict matching the Config models
+
+        Args:
+            config_path: Configuration file path
+
+        Returns:
+            Nested configuration dict (not yet validated)
+
         Raises:
             FileNotFoundError: Configuration file does not exist
             ValueError: Invalid configuration format or missing required fields
@@ -177,60 +204,61 @@ class Config(BaseModel):
 
         # Parse retry configuration
         retry_data = data.get("retry", {})
-        retry_config = RetryConfig(
-            enabled=retry_data.get("enabled", True),
-            max_retries=retry_data.get("max_retries", 3),
-            initial_delay=retry_data.get("initial_delay", 1.0),
-            max_delay=retry_data.get("max_delay", 60.0),
-            exponential_base=retry_data.get("exponential_base", 2.0),
-        )
-
-        llm_config = LLMConfig(
-            api_key=data["api_key"],
-            api_base=data.get("api_base", "https://api.minimax.io"),
-            model=data.get("model", "MiniMax-M2.1"),
-            provider=data.get("provider", "anthropic"),
-            proxy=data.get("proxy"),
-            reasoning_split=data.get("reasoning_split", False),
-            retry=retry_config,
-            model_context_limit=data.get("model_context_limit"),
-            context_safety_margin=data.get("context_safety_margin", 512),
-        )
+        retry_config = {
+            "enabled": retry_data.get("enabled", True),
+            "max_retries": retry_data.get("max_retries", 3),
+            "initial_delay": retry_data.get("initial_delay", 1.0),
+            "max_delay": retry_data.get("max_delay", 60.0),
+            "exponential_base": retry_data.get("exponential_base", 2.0),
+        }
+
+        llm_config = {
+            "api_key": data["api_key"],
+            "api_base": data.get("api_base", "https://api.minimax.io"),
+            "model": data.get("model", "MiniMax-M2.1"),
+            "provider": data.get("provider", "anthropic"),
+            "proxy": data.get("proxy"),
+            "reasoning_split": data.get("reasoning_split", False),
+            "retry": retry_config,
+            "model_context_limit": data.get("model_context_limit"),
+            "context_safety_margin": data.get("context_safety_margin", 512),
+            "prompt_caching": data.get("prompt_caching", False),
+        }
 
         # Parse Agent configuration
-        agent_config = AgentConfig(
-            max_steps=data.get("max_steps", 50),
-            workspace_dir=data.get("workspace_dir", "./workspace"),
-            system_prompt_path=data.get("system_prompt_path", "system_prompt.md"),
-        )
+        agent_config = {
+            "max_steps": data.get("max_steps", 50),
+            "workspace_dir": data.get("workspace_dir", "./workspace"),
+            "system_prompt_path": data.get("system_prompt_path", "system_prompt.md"),
+        }
 
         # Parse tools configuration
         tools_data = data.get("tools", {})
 
         # Parse MCP configuration
         mcp_data = tools_data.get("mcp", {})
-        mcp_config = MCPConfig(
-            connect_timeout=mcp_data.get("connect_timeout", 10.0),
-            execute_timeout=mcp_data.get("execute_timeout", 60.0),
-            sse_read_timeout=mcp_data.get("sse_read_timeout", 120.0),
-        )
-
-        tools_config = ToolsConfig(
-            enable_file_tools=tools_data.get("enable_file_tools", True),
-            enable_bash=tools_data.get("enable_bash", True),
-            enable_note=tools_data.get("enable_note", True),
-            enable_skills=tools_data.get("enable_skills", True),
-            skills_dir=tools_data.get("skills_dir", "./skills"),
-            enable_mcp=tools_data.get("enable_mcp", True),
-            mcp_config_path=tools_data.get("mcp_config_path", "mcp.json"),
-            mcp=mcp_config,
-        )
-
-        return cls(
-            llm=llm_config,
-            agent=agent_config,
-            tools=tools_config,
-        )
+        mcp_config = {
+            "connect_timeout": mcp_data.get("connect_timeout", 10.0),
+            "execute_timeout": mcp_data.get("execute_timeout", 60.0),
+            "sse_read_timeout": mcp_data.get("sse_read_timeout", 120.0),
+        }
+
+        tools_config = {
+            "enable_file_tools": tools_data.get("enable_file_tools", True),
+            "enable_bash": tools_data.get("enable_bash", True),
+            "enable_note": tools_data.get("enable_note", True),
+            "enable_skills": tools_data.get("enable_skills", True),
+            "skills_dir": tools_data.get("skills_dir", "./skills"),
+            "enable_mcp": tools_data.get("enable_mcp", True),
+            "mcp_config_path": tools_data.get("mcp_config_path", "mcp.json"),
+            "mcp": mcp_config,
+        }
+
+        return {
+            "llm": llm_config,
+            "agent": agent_config,
+            "tools": tools_config,
+        }
 
     @staticmethod
     def get_package_dir() -> Path:
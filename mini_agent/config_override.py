@@ -8,13 +8,29 @@ Provides flexible configuration overriding through:
 Priority order: CLI > Environment > Override File > Base Config
 """
 
+import copy
+import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+import yaml
 
-@dataclass
+try:
+    # libyaml-backed loader, much faster than the pure-Python SafeLoader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+logger = logging.getLogger(__name__)
+
+# Parsed override files keyed by path, with the (mtime, size, inode) they were
+# read at; size and inode catch same-timestamp edits and atomic replacements
+_FILE_CACHE: Dict[Path, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+
+
+@dataclass(slots=True, frozen=True)
 class OverrideSource:
     """Metadata about where a configuration value comes from"""
     value: Any
@@ -57,14 +73,6 @@ class ConfigOverride:
         "MINI_AGENT_MCP_CONFIG_PATH": ("tools", "mcp_config_path"),
     }
 
-    # Type conversion functions for different fields
-    TYPE_CONVERTERS = {
-        bool: lambda x: str(x).lower() in ("true", "1", "yes", "on"),
-        int: lambda x: int(x),
-        float: lambda x: float(x),
-        str: lambda x: str(x),
-    }
-
     def __init__(self, verbose: bool = False):
         """
         Initialize override system.
@@ -74,7 +82,7 @@ class ConfigOverride:
         """
         self.verbose = verbose
         self.overrides: Dict[str, OverrideSource] = {}
-        self.cli_args: Dict[str, Any] = {}
+        self.cli_args: List[Tuple[Tuple[str, ...], Any]] = []
 
     def set_cli_override(self, path: str, value: Any):
         """
@@ -84,31 +92,35 @@ class ConfigOverride:
             path: Dot-separated config path (e.g., "llm.model")
             value: Override value
         """
-        self.cli_args[path] = value
-
-    def get_env_overrides(self) -> Dict[str, Any]:
-        """Get all environment variable overrides."""
-        overrides = {}
-
-        for env_var, path_tuple in self.ENV_VAR_MAPPING.items():
-            value = os.getenv(env_var)
-            if value is not None:
-                # Navigate through nested structure
-                current = overrides
-                for part in path_tuple[:-1]:
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
-
-                # Convert value type
-                field_name = path_tuple[-1]
-                converted_value = self._convert_value(value, field_name)
-                current[field_name] = converted_value
-
-                if self.verbose:
-                    self.overrides[f"{'.'.join(path_tuple)}"] = OverrideSource(
-                        converted_value, "env"
-                    )
+        self.cli_args.append((tuple(path.split(".")), value))
+
+    def get_env_overrides(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        """Get all environment variable overrides as (config path, value) pairs.
+
+        Only variables listed in ENV_VAR_MAPPING are honoured; there is no
+        generic MINI_AGENT_* prefix handling, so the cost scales with the
+        number of mapped variables actually set.
+        """
+        global _unknown_env_reported
+        if not _unknown_env_reported and logger.isEnabledFor(logging.DEBUG):
+            # One-off diagnostic scan, only when debug logging is on
+            _unknown_env_reported = True
+            unknown = sorted(k for k in os.environ if k.startswith("MINI_AGENT_") and k not in _ENV_KEYS)
+            if unknown:
+                logger.debug("Ignoring unknown MINI_AGENT_* environment variables: %s", ", ".join(unknown))
+
+        # Only visit mapped variables that are actually set
+        present = _ENV_KEYS & os.environ.keys()
+
+        overrides = []
+        for env_var in present:
+            path_tuple, converter = _ENV_TABLE[env_var]
+            raw = os.environ[env_var]
+            try:
+                value = converter(raw)
+            except ValueError as e:
+                raise ValueError(f"Invalid value for {env_var}: {raw!r}") from e
+            overrides.append((path_tuple, value))
 
         return overrides
 
@@ -119,25 +131,37 @@ class ConfigOverride:
         Args:
             override_path: Optional override file path. If None, searches standard locations.
         """
-        import yaml
-
         if override_path is None:
             # Search for override file in standard locations
             from .config import Config
             override_path = Config.find_config_file("config-override.yaml")
 
-        if override_path is None or not override_path.exists():
+        try:
+            stat = override_path.stat() if override_path is not None else None
+        except FileNotFoundError:
+            stat = None
+
+        if stat is None:
             if self.verbose:
                 print(f"No override file found at {override_path}")
             return {}
 
-        with open(override_path, encoding="utf-8") as f:
-            override_data = yaml.safe_load(f) or {}
+        # Reuse the parsed contents while the file is unchanged. Callers get a
+        # copy: merged results embed override subtrees as-is, so handing out
+        # the cached dict would let one caller's edits leak into later loads.
+        file_key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        cached = _FILE_CACHE.get(override_path)
+        if cached is not None and cached[0] == file_key:
+            override_data = cached[1]
+        else:
+            with open(override_path, encoding="utf-8") as f:
+                override_data = yaml.load(f, Loader=_YamlLoader) or {}
+            _FILE_CACHE[override_path] = (file_key, override_data)
 
         if self.verbose and override_data:
             print(f"Loaded overrides from: {override_path}")
 
-        return override_data
+        return copy.deepcopy(override_data)
 
     def apply_overrides(self, config_dict: Dict[str, Any], override_file: Optional[Path] = None) -> Dict[str, Any]:
         """
@@ -150,31 +174,39 @@ class ConfigOverride:
             override_file: Optional path to override file
 
         Returns:
-            Merged configuration dictionary
+            Merged configuration dictionary (``config_dict`` itself when
+            there is nothing to override)
         """
-        import copy
+        file_overrides = self.get_file_overrides(override_file)
+        env_overrides = self.get_env_overrides()
 
-        result = copy.deepcopy(config_dict)
+        # Common default path: nothing to merge
+        if not (self.cli_args or file_overrides or env_overrides):
+            return config_dict
+
+        # Only the top level is copied here; _deep_merge and _set_nested_value
+        # copy nested dicts along the paths they touch, so the caller's dict
+        # is never mutated and untouched leaves are shared.
+        result = dict(config_dict)
 
         # Apply file overrides
-        file_overrides = self.get_file_overrides(override_file)
         if file_overrides:
             result = self._deep_merge(result, file_overrides)
             if self.verbose:
                 for key, value in file_overrides.items():
-                    self._track_overrides(result, [key], "override_yaml", value)
+                    self._track_overrides(result, (key,), "override_yaml", value)
 
         # Apply environment overrides
-        env_overrides = self.get_env_overrides()
-        if env_overrides:
-            result = self._deep_merge(result, env_overrides)
+        for path_parts, value in env_overrides:
+            self._set_nested_value(result, path_parts, value)
+            if self.verbose:
+                self.overrides[".".join(path_parts)] = OverrideSource(value, "env")
 
         # Apply CLI overrides
         if self.cli_args:
-            for path, value in self.cli_args.items():
-                path_parts = path.split(".")
+            for path_parts, value in self.cli_args:
                 self._set_nested_value(result, path_parts, value)
-                self.overrides[path] = OverrideSource(value, "cli")
+                self.overrides[".".join(path_parts)] = OverrideSource(value, "cli")
 
         # Print summary if verbose
         if self.verbose and self.overrides:
@@ -187,53 +219,86 @@ class ConfigOverride:
 
         return result
 
-    def _convert_value(self, value: str, field_name: str) -> Any:
-        """Convert string value to appropriate type based on field name."""
-        # Boolean fields
-        if field_name in ("enabled", "enable_file_tools", "enable_bash", "enable_note",
-                         "enable_skills", "enable_mcp", "reasoning_split"):
-            return self.TYPE_CONVERTERS[bool](value)
-
-        # Numeric fields
-        if field_name in ("max_steps", "initial_delay", "max_delay", "exponential_base",
-                         "max_retries"):
-            if "." in value:
-                return self.TYPE_CONVERTERS[float](value)
-            return self.TYPE_CONVERTERS[int](value)
-
-        # String fields (default)
-        return self.TYPE_CONVERTERS[str](value)
-
     def _deep_merge(self, base: Dict, override: Dict) -> Dict:
-        """Deep merge two dictionaries."""
-        import copy
+        """Deep merge two dictionaries.
 
-        result = copy.deepcopy(base)
+        Returns a new dict; nested dicts are copied only where both sides
+        have a dict, leaf values are shared with the inputs.
+        """
+        result = dict(base)
 
         for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
+            base_value = result.get(key)
+            if isinstance(base_value, dict) and isinstance(value, dict):
+                result[key] = self._deep_merge(base_value, value)
             else:
                 result[key] = value
 
         return result
 
-    def _set_nested_value(self, data: Dict, path_parts: list, value: Any):
+    def _set_nested_value(self, data: Dict, path_parts: Tuple[str, ...], value: Any):
         """Set a value in nested dictionary using path parts."""
         current = data
         for part in path_parts[:-1]:
-            if part not in current:
-                current[part] = {}
+            # Copy on write so nested dicts shared with the base config stay untouched
+            current[part] = dict(current.get(part, {}))
             current = current[part]
         current[path_parts[-1]] = value
 
-    def _track_overrides(self, data: Dict, path: list, source: str, value: Any):
-        """Track override sources recursively."""
-        if isinstance(value, dict):
-            for k, v in value.items():
-                self._track_overrides(data, path + [k], source, v)
-        else:
-            self.overrides[".".join(path)] = OverrideSource(value, source)
+    def _track_overrides(self, data: Dict, path: Tuple[str, ...], source: str, value: Any):
+        """Track override sources for every leaf under path (iterative walk)."""
+        stack = [(path, value)]
+        while stack:
+            current_path, current = stack.pop()
+            if isinstance(current, dict):
+                for k, v in current.items():
+                    stack.append((current_path + (k,), v))
+            else:
+                self.overrides[".".join(current_path)] = OverrideSource(current, source)
+
+
+# Field names grouped by the type their environment value converts to
+_BOOL_FIELDS = frozenset({
+    "enabled", "enable_file_tools", "enable_bash", "enable_note",
+    "enable_skills", "enable_mcp", "reasoning_split",
+})
+_INT_FIELDS = frozenset({"max_steps", "max_retries"})
+_FLOAT_FIELDS = frozenset({"initial_delay", "max_delay", "exponential_base"})
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in ("true", "1", "yes", "on")
+
+
+def _parse_int(value: str) -> Any:
+    # Values like "5.0" stay floats and are left to pydantic validation
+    if "." in value:
+        return float(value)
+    return int(value)
+
+
+def _pick_converter(field_name: str) -> Callable[[str], Any]:
+    """Select the string converter for a config field (str by default)."""
+    if field_name in _BOOL_FIELDS:
+        return _parse_bool
+    if field_name in _INT_FIELDS:
+        return _parse_int
+    if field_name in _FLOAT_FIELDS:
+        return float
+    return str
+
+
+# Environment variable -> (config path, converter), resolved once at import
+_ENV_TABLE: Dict[str, Tuple[Tuple[str, ...], Callable[[str], Any]]] = {
+    env_var: (path_tuple, _pick_converter(path_tuple[-1]))
+    for env_var, path_tuple in ConfigOverride.ENV_VAR_MAPPING.items()
+}
+
+# Names of all mapped environment variables, for fast intersection with os.environ
+_ENV_KEYS = frozenset(_ENV_TABLE)
+
+# Whether unknown MINI_AGENT_* variables have already been reported
+_unknown_env_reported = False
 
 
 def load_config_with_overrides(
@@ -270,11 +335,11 @@ def load_config_with_overrides(
         for path, value in cli_args.items():
             override_manager.set_cli_override(path, value)
 
-    # Load base config as dict
-    base_config = Config.load().model_dump()
+    # Load base config as an unvalidated dict
+    base_config = Config.load_raw()
 
     # Apply overrides
     merged_config = override_manager.apply_overrides(base_config, override_file=override_file)
 
-    # Reconstruct Config object
-    return Config(**merged_config)
\ No newline at end of file
+    # Validate once, after all overrides are in place
+    return Config.model_validate(merged_config)
\ No newline at end of file
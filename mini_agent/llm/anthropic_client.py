@@ -29,6 +29,7 @@ class AnthropicClient(LLMClientBase):
         retry_config: RetryConfig | None = None,
         model_context_limit: int | None = None,
         context_safety_margin: int = 512,
+        prompt_caching: bool = False,
     ):
         """Initialize Anthropic client.
 
@@ -37,8 +38,12 @@ class AnthropicClient(LLMClientBase):
             api_base: Base URL for the API (default: MiniMax Anthropic endpoint)
             model: Model name to use (default: MiniMax-M2.1)
             retry_config: Optional retry configuration
+            prompt_caching: Mark the system prompt with `cache_control` so the
+                provider can cache it across steps (only for endpoints that
+                support Anthropic prompt caching)
         """
         super().__init__(api_key, api_base, model, retry_config=retry_config, model_context_limit=model_context_limit, context_safety_margin=context_safety_margin)
+        self.prompt_caching = prompt_caching
 
         # Initialize Anthropic async client
         self.client = anthropic.AsyncAnthropic(
@@ -73,7 +78,18 @@ class AnthropicClient(LLMClientBase):
         }
 
         if system_message:
-            params["system"] = system_message
+            if self.prompt_caching:
+                # Mark the system prompt as a cacheable prefix so repeated steps
+                # of the same conversation reuse the provider-side prompt cache
+                params["system"] = [
+                    {
+                        "type": "text",
+                        "text": system_message,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
+            else:
+                params["system"] = system_message
 
         if tools:
             params["tools"] = self._convert_tools(tools)
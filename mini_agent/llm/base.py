@@ -3,17 +3,37 @@
 from abc import ABC, abstractmethod
 from typing import Any, List
 
+import io
 import logging
 import json
-
-import tiktoken
+import weakref
 
 from ..retry import RetryConfig
 from ..schema import LLMResponse, Message
 from ..tools.file_tools import truncate_text_by_tokens
+from ..utils.token_utils import count_tokens, count_tokens_batch
+
+try:
+    # optional: C-accelerated JSON encoding for structured content and tool calls
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Flattened token-estimation text per message, keyed by id(msg) since Message is
+# unhashable. Entries remember the content/thinking/tool_calls objects they were
+# built from and are rebuilt when any of those fields is reassigned; truncated
+# copies are new objects and so start uncached.
+_MESSAGE_TEXT_CACHE: dict[int, tuple[Any, Any, Any, str]] = {}
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to JSON text (non-ASCII kept as-is), via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False)
+
 
 class LLMClientBase(ABC):
     """Abstract base class for LLM clients.
@@ -55,46 +75,29 @@ class LLMClientBase(ABC):
         # Callback for tracking retry count
         self.retry_callback = None
 
-    def _estimate_tokens_for_messages(self, messages: list[Message]) -> int:
-        """Estimate token count for a list of Message objects using cl100k_base.
+    @staticmethod
+    def _message_text(msg: Message) -> str:
+        """Flatten a Message into the text used for token estimation.
 
-        This is an approximation (for pruning decisions only).
+        The result is cached per message, since the same history is re-estimated
+        on every agent step and serializing tool calls walks pydantic models.
         """
-        encoding = tiktoken.get_encoding("cl100k_base")
-        total = 0
-        for msg in messages:
-            parts = [msg.role]
-            # content may be string or structured; stringify for token estimation
-            if isinstance(msg.content, str):
-                parts.append(msg.content)
-            else:
-                try:
-                    parts.append(json.dumps(msg.content, ensure_ascii=False))
-                except Exception:
-                    parts.append(str(msg.content))
+        cached = _MESSAGE_TEXT_CACHE.get(id(msg))
+        if (
+            cached is not None
+            and cached[0] is msg.content
+            and cached[1] is msg.thinking
+            and cached[2] is msg.tool_calls
+        ):
+            return cached[3]
 
-            if msg.thinking:
-                parts.append(msg.thinking)
-
-            if msg.tool_calls:
-                try:
-                    parts.append(json.dumps([tc.dict() for tc in msg.tool_calls], ensure_ascii=False))
-                except Exception:
-                    parts.append(str(msg.tool_calls))
-
-            chunk = "\n".join(parts)
-            total += len(encoding.encode(chunk, disallowed_special=()))
-        return total
-
-    def _estimate_tokens_for_message(self, msg: Message) -> int:
-        """Estimate tokens for a single Message (helper)."""
-        encoding = tiktoken.get_encoding("cl100k_base")
         parts = [msg.role]
+        # content may be string or structured; stringify for token estimation
         if isinstance(msg.content, str):
             parts.append(msg.content)
         else:
             try:
-                parts.append(json.dumps(msg.content, ensure_ascii=False))
+                parts.append(_json_dumps(msg.content))
             except Exception:
                 parts.append(str(msg.content))
 
@@ -103,12 +106,42 @@ class LLMClientBase(ABC):
 
         if msg.tool_calls:
             try:
-                parts.append(json.dumps([tc.dict() for tc in msg.tool_calls], ensure_ascii=False))
+                parts.append(_json_dumps([tc.model_dump() for tc in msg.tool_calls]))
             except Exception:
                 parts.append(str(msg.tool_calls))
 
-        chunk = "\n".join(parts)
-        return len(encoding.encode(chunk, disallowed_special=()))
+        text = "\n".join(parts)
+        if id(msg) not in _MESSAGE_TEXT_CACHE:
+            # Drop the entry when the message is garbage collected, before its id can be reused
+            weakref.finalize(msg, _MESSAGE_TEXT_CACHE.pop, id(msg), None)
+        _MESSAGE_TEXT_CACHE[id(msg)] = (msg.content, msg.thinking, msg.tool_calls, text)
+        return text
+
+    @staticmethod
+    def _token_upper_bound(text: str) -> int:
+        """Upper bound on the token count of text, without tokenizing.
+
+        Every BPE token covers at least one UTF-8 byte, so the byte length can
+        never be exceeded; for ASCII text that is simply the character count.
+        """
+        if text.isascii():
+            return len(text)
+        return len(text.encode("utf-8"))
+
+    def _estimate_tokens_per_message(self, messages: list[Message]) -> list[int]:
+        """Estimate token counts for each message, tokenizing them in one batch call."""
+        return count_tokens_batch([self._message_text(msg) for msg in messages])
+
+    def _estimate_tokens_for_messages(self, messages: list[Message]) -> int:
+        """Estimate token count for a list of Message objects using cl100k_base.
+
+        This is an approximation (for pruning decisions only).
+        """
+        return sum(self._estimate_tokens_per_message(messages))
+
+    def _estimate_tokens_for_message(self, msg: Message) -> int:
+        """Estimate tokens for a single Message (helper)."""
+        return count_tokens(self._message_text(msg))
 
     def enforce_context_limit(self, messages: List[Message], *,
                               model_context_limit: int | None = None,
@@ -120,7 +153,8 @@ class LLMClientBase(ABC):
         - Truncate very long individual message contents using `truncate_text_by_tokens`.
         - If still too large, prune oldest non-system messages until under limit.
 
-        Returns a possibly-modified copy of messages.
+        Returns the original list when it already fits; otherwise a new list.
+        Input messages are never mutated (truncated ones are replaced by copies).
         """
         # Default to a large context if not provided (safe upper bound)
         # Resolve defaults from instance if not provided
@@ -130,116 +164,106 @@ class LLMClientBase(ABC):
         # Target is a bit below limit to leave room for completion tokens
         target = max(1024, limit - margin)
 
-        # Work on a shallow copy
-        msgs = [m.copy() for m in messages]
+        if len(messages) > 1:
+            logger.debug("First non-system message: %r", messages[1])
+
+        # Skip the tokenizer only when even the byte-length upper bound fits
+        if sum(self._token_upper_bound(self._message_text(m)) for m in messages) <= target:
+            return messages
 
-        print(msgs[1])
+        # Tokenize each message once; entries are refreshed only when a
+        # message's content is truncated below
+        token_counts: dict[int, int] = dict(
+            zip((id(m) for m in messages), self._estimate_tokens_per_message(messages))
+        )
 
-        total = self._estimate_tokens_for_messages(msgs)
+        total = sum(token_counts.values())
         if total <= target:
-            return msgs      
+            return messages
+
+        # Over the limit: work on a new list, copying only messages that change
+        msgs = list(messages)
 
         logger.warning("Context token estimate %d > limit %d; compressing messages", total, target)
 
         # First, try truncating long message contents
         per_message_target = min(8192, max(512, target // 8))
-        for m in msgs:
-            if isinstance(m.content, str):
-                # estimate tokens for this content
-                encoding = tiktoken.get_encoding("cl100k_base")
-                tok = len(encoding.encode(m.content, disallowed_special=()))
-                if tok > per_message_target:
-                    # Truncate content in-place
-                    m.content = truncate_text_by_tokens(m.content, per_message_target)
-
-        total = self._estimate_tokens_for_messages(msgs)
+        for i, m in enumerate(msgs):
+            # A message's content never has more tokens than the whole message,
+            # so the counts above rule out most messages without re-tokenizing;
+            # truncate_text_by_tokens returns the content itself if it fits
+            if isinstance(m.content, str) and token_counts[id(m)] > per_message_target:
+                content = truncate_text_by_tokens(m.content, per_message_target)
+                if content is not m.content:
+                    # Replace with a truncated copy
+                    truncated = m.model_copy(update={"content": content})
+                    msgs[i] = truncated
+                    del token_counts[id(m)]
+                    token_counts[id(truncated)] = self._estimate_tokens_for_message(truncated)
+
+        total = sum(token_counts.values())
         if total <= target:
             return msgs
 
         # If still too big, perform phase-aware pruning and create a brief summary
         system_msgs = [m for m in msgs if m.role == "system"]
         user_msgs = [m for m in msgs if m.role == "user"]
-        assistant_msgs = [m for m in msgs if m.role == "assistant"]
-        tool_msgs = [m for m in msgs if m.role == "tool"]
-
-        # Keep essentials: all system messages, first user instruction, last user instruction,
-        # and recent assistant planning messages (assistant messages that have thinking)
+        # Recent assistant planning blocks (assistant messages that have thinking)
+        planning_msgs = [m for m in msgs if m.role == "assistant" and m.thinking]
+
+        # Keep essentials: all system messages, first and last user instruction,
+        # up to 3 most recent planning messages, and the last 4 messages for
+        # immediate context (ids are used since Message is unhashable)
+        preserved_ids = {
+            id(m)
+            for m in (*system_msgs, *user_msgs[:1], *planning_msgs[-3:], *user_msgs[-1:], *msgs[-4:])
+        }
+
+        # Partition in one pass, keeping chronological order in both lists
         preserved: list[Message] = []
-        preserved.extend(system_msgs)
-
-        # Preserve first user instruction if exists
-        if user_msgs:
-            preserved.append(user_msgs[0])
-
-        # Preserve recent assistant planning blocks (with thinking), keep up to 3 most recent
-        planning_msgs = [m for m in assistant_msgs if m.thinking]
-        if planning_msgs:
-            preserved.extend(planning_msgs[-3:])
-
-        # Preserve last user instruction (most recent)
-        if user_msgs:
-            preserved_ids = {id(m) for m in preserved}
-            if id(user_msgs[-1]) not in preserved_ids:
-                preserved.append(user_msgs[-1])
-                preserved_ids.add(id(user_msgs[-1]))
-
-        # Also always preserve the last few messages (most recent 4) to keep immediate context
-        recent_msgs = msgs[-4:]
-        for m in recent_msgs:
-            if id(m) not in preserved_ids:
-                preserved.append(m)
-                preserved_ids.add(id(m))
-
-        # Build prunable list as msgs excluding preserved (use ids to avoid unhashable Message)
-        prunable = [m for m in msgs if id(m) not in preserved_ids]
-
-        removed_accumulator: list[Message] = []
-
-        # Precompute token counts to avoid repeatedly re-tokenizing large content
-        token_counts: dict[int, int] = {}
-        for m in preserved + prunable:
-            token_counts[id(m)] = self._estimate_tokens_for_message(m)
-
-        preserved_tokens = sum(token_counts.get(id(m), 0) for m in preserved)
-        prunable_tokens = sum(token_counts.get(id(m), 0) for m in prunable)
-
-        # Remove oldest prunable messages until under target, subtracting token counts
-        max_iterations = max(1000, len(prunable) * 2)
-        iterations = 0
-        while prunable and (preserved_tokens + prunable_tokens) > target:
-            if iterations >= max_iterations:
-                logger.warning("Reached pruning iteration limit (%d); stopping pruning early", max_iterations)
-                break
-            removed = prunable.pop(0)
-            removed_accumulator.append(removed)
-            removed_tokens = token_counts.get(id(removed), self._estimate_tokens_for_message(removed))
+        prunable: list[Message] = []
+        for m in msgs:
+            (preserved if id(m) in preserved_ids else prunable).append(m)
+
+        preserved_tokens = sum(token_counts[id(m)] for m in preserved)
+        prunable_tokens = sum(token_counts[id(m)] for m in prunable)
+
+        # Remove oldest prunable messages until under target, subtracting token counts.
+        # Advance an index instead of pop(0) to keep this linear.
+        removed_count = 0
+        while removed_count < len(prunable) and (preserved_tokens + prunable_tokens) > target:
+            removed = prunable[removed_count]
+            removed_count += 1
+            removed_tokens = token_counts[id(removed)]
             prunable_tokens -= removed_tokens
             logger.info("Pruned message role=%s token_count=%d during context compression", removed.role, removed_tokens)
-            iterations += 1
+
+        removed_accumulator = prunable[:removed_count]
 
         # Reassemble compressed messages preserving original chronological order
-        allowed_ids = preserved_ids.union({id(m) for m in prunable})
-        compressed = [m for m in msgs if id(m) in allowed_ids]
+        removed_ids = {id(m) for m in removed_accumulator}
+        compressed = [m for m in msgs if id(m) not in removed_ids]
 
         # If we removed anything, insert a concise system notice summarizing removed content
         if removed_accumulator:
-            # Create a short summary by concatenating short excerpts from removed messages
-            excerpts: list[str] = []
-            for rm in removed_accumulator:
-                excerpt_text = ""
+            # Create a short summary from excerpts of the 20 most recently removed
+            # messages (at most ~8k characters), written into one buffer
+            buf = io.StringIO()
+            buf.write("\n\n... [Earlier conversation truncated to fit model context window] ...\n\n")
+            for n, rm in enumerate(removed_accumulator[-20:]):
                 if isinstance(rm.content, str):
                     excerpt_text = rm.content.strip()[:400]
                 else:
                     try:
-                        excerpt_text = json.dumps(rm.content, ensure_ascii=False)[:400]
+                        excerpt_text = _json_dumps(rm.content)[:400]
                     except Exception:
                         excerpt_text = str(rm.content)[:400]
-                excerpts.append(f"[{rm.role}] {excerpt_text}")
-
-            summary_text = "\n\n... [Earlier conversation truncated to fit model context window] ...\n\n" + "\n---\n".join(excerpts)
+                if n:
+                    buf.write("\n---\n")
+                buf.write(f"[{rm.role}] {excerpt_text}")
 
             # Truncate the summary to a safe token size
-            summary_text = truncate_text_by_tokens(summary_text, per_message_target)
+            summary_text = truncate_text_by_tokens(buf.getvalue(), per_message_target)
 
             notice = Message(role="system", content=f"Conversation summary (truncated):\n{summary_text}")
 
@@ -44,6 +44,7 @@ class LLMClient:
         retry_config: RetryConfig | None = None,
         model_context_limit: int | None = None,
         context_safety_margin: int = 512,
+        prompt_caching: bool = False,
     ):
         """Initialize LLM client with specified provider.
 
@@ -55,6 +56,8 @@ class LLMClient:
                      For third-party APIs (e.g., https://api.siliconflow.cn/v1), used as-is.
             model: Model name to use
             retry_config: Optional retry configuration
+            prompt_caching: Enable Anthropic prompt caching of the system prompt
+                (anthropic provider only; the endpoint must support it)
         """
         self.provider = provider
         self.api_key = api_key
@@ -95,6 +98,7 @@ class LLMClient:
                 retry_config=retry_config,
                 model_context_limit=model_context_limit,
                 context_safety_margin=context_safety_margin,
+                prompt_caching=prompt_caching,
             )
         elif provider == LLMProvider.OPENAI:
             self._client = OpenAIClient(
@@ -19,9 +19,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Union
+import heapq
+import itertools
 import math
+import re
 import time
 
+# word separators counted by token estimation
+_SEPARATOR_RE = re.compile(r"[ \t\n]")
+
 
 @dataclass
 class ContextItem:
@@ -48,24 +54,29 @@ class ContextSelector:
         self.avg_tokens_per_word = avg_tokens_per_word
 
     def _estimate_tokens(self, text: str) -> int:
-        # conservative word-based estimation (fast, no external deps)
-        words = text.split()
-        return max(1, int(len(words) * self.avg_tokens_per_word))
-
-    def _lexical_score(self, query: str, text: str) -> float:
-        q_words = set(w.lower() for w in query.split())
-        t_words = set(w.lower() for w in text.split())
-        if not q_words or not t_words:
+        # conservative word-based estimation: counting separators (runs of
+        # whitespace overcount) avoids building a list of every word
+        words = text.count(" ") + text.count("\n") + text.count("\t") + 1
+        return max(1, int(words * self.avg_tokens_per_word))
+
+    @staticmethod
+    def _query_tokens(query: str) -> frozenset:
+        return frozenset(query.lower().split())
+
+    def _lexical_score(self, q_tokens: frozenset, item: ContextItem) -> float:
+        if not q_tokens:
             return 0.0
-        overlap = q_words & t_words
-        return len(overlap) / max(1, len(q_words))
+        # lowercase the text once; intersection() consumes the words directly
+        return len(q_tokens.intersection(item.text.lower().split())) / len(q_tokens)
 
-    def _recency_score(self, metadata: Dict[str, Any]) -> float:
+    def _recency_score(self, metadata: Dict[str, Any], now: Optional[float] = None) -> float:
         ts = metadata.get("ts")
         if not ts:
             return 0.0
+        if now is None:
+            now = time.time()
         # newer items get scores in (0,1]; very old items approach 0
-        age = max(0.0, time.time() - float(ts))
+        age = max(0.0, now - float(ts))
         # use a soft decay (seconds -> days scale)
         days = age / (60 * 60 * 24)
         return 1.0 / (1.0 + days)
@@ -77,9 +88,17 @@ class ContextSelector:
         except Exception:
             return 0.0
 
-    def score_item(self, item: ContextItem, query: str) -> float:
-        lex = self._lexical_score(query, item.text)
-        rec = self._recency_score(item.metadata)
+    def score_item(
+        self,
+        item: ContextItem,
+        query: str,
+        q_tokens: Optional[frozenset] = None,
+        now: Optional[float] = None,
+    ) -> float:
+        if q_tokens is None:
+            q_tokens = self._query_tokens(query)
+        lex = self._lexical_score(q_tokens, item)
+        rec = self._recency_score(item.metadata, now)
         imp = self._importance_score(item.metadata)
         # combine with weights: lexical most important
         score = 0.7 * lex + 0.2 * rec + 0.1 * imp
@@ -102,8 +121,6 @@ class ContextSelector:
         messages = messages or []
         tools_outputs = tools_outputs or []
 
-        items: List[ContextItem] = []
-
         def normalize(src: str, entry: Union[str, Dict[str, Any]]):
             if isinstance(entry, str):
                 return ContextItem(source=src, text=entry, metadata={})
@@ -113,32 +130,47 @@ class ContextSelector:
                 return ContextItem(source=src, text=str(text), metadata=meta)
             return ContextItem(source=src, text=str(entry), metadata={})
 
-        for d in documents:
-            items.append(normalize("document", d))
-        for m in messages:
-            items.append(normalize("message", m))
-        for t in tools_outputs:
-            items.append(normalize("tool", t))
-
+        # every candidate needs a score before ranking, so items are built in
+        # one pass over the chained sources rather than three append loops
+        items: List[ContextItem] = [
+            normalize(src, entry)
+            for src, entry in itertools.chain(
+                (("document", d) for d in documents),
+                (("message", m) for m in messages),
+                (("tool", t) for t in tools_outputs),
+            )
+        ]
+
+        # one clock read per selection keeps recency scores consistent across items
+        q_tokens = self._query_tokens(query)
+        now = time.time()
         for it in items:
-            it.score = self.score_item(it, query)
+            it.score = self.score_item(it, query, q_tokens, now)
 
-        # sort by descending score, break ties by shorter estimated tokens
-        items.sort(key=lambda x: (x.score, -len(x.text)), reverse=True)
+        # rank by descending score, break ties by shorter text (then input order).
+        # A heap yields items in that order lazily, so only the items actually
+        # visited before the budget is exhausted pay the O(log n) pop.
+        heap = [(-it.score, len(it.text), i) for i, it in enumerate(items)]
+        heapq.heapify(heap)
+
+        def ranked():
+            while heap:
+                yield items[heapq.heappop(heap)[2]]
 
         selected = []
         used_tokens = 0
 
-        for it in items:
+        for it in ranked():
             est = self._estimate_tokens(it.text)
             if used_tokens + est > token_budget:
                 # try to include a truncated version if item is highly relevant
                 if it.score >= 0.6 and used_tokens < token_budget:
                     remaining = token_budget - used_tokens
-                    # naive truncation by words
-                    words = it.text.split()
-                    truncated = " ".join(words[: max(1, int(remaining / max(1, self.avg_tokens_per_word)))])
-                    sel_text = truncated
+                    # naive truncation by words: cut at the separator that would
+                    # start word `keep + 1`, scanning only that far into the text
+                    keep = max(1, int(remaining / max(1, self.avg_tokens_per_word)))
+                    cut = next(itertools.islice(_SEPARATOR_RE.finditer(it.text), keep - 1, keep), None)
+                    sel_text = it.text[: cut.start()] if cut is not None else it.text
                     sel_est = self._estimate_tokens(sel_text)
                     selected.append({
                         "source": it.source,
@@ -148,6 +180,8 @@ class ContextSelector:
                         "est_tokens": sel_est,
                     })
                     used_tokens += sel_est
+                if used_tokens >= token_budget:
+                    break
                 continue
             selected.append({
                 "source": it.source,
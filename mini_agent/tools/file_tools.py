@@ -3,8 +3,7 @@
 from pathlib import Path
 from typing import Any
 
-import tiktoken
-
+from ..utils.token_utils import count_tokens
 from .base import Tool, ToolResult
 
 
@@ -29,8 +28,7 @@ def truncate_text_by_tokens(
         >>> truncated = truncate_text_by_tokens(text, 64000)
         >>> print(truncated)
     """
-    encoding = tiktoken.get_encoding("cl100k_base")
-    token_count = len(encoding.encode(text))
+    token_count = count_tokens(text)
 
     # Return original text if under limit
     if token_count <= max_tokens:
@@ -0,0 +1,24 @@
+"""Asyncio entry-point helpers."""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+def run_async(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion, on uvloop when it is installed.
+
+    uvloop is an optional dependency (a faster libuv-based event loop).
+    Without it, or with a release older than ``uvloop.run`` (0.18), this is
+    plain ``asyncio.run``.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+
+    run = getattr(uvloop, "run", None)
+    if run is None:
+        return asyncio.run(main)
+    return run(main)
@@ -4,9 +4,12 @@ This module provides cross-platform support for capturing keyboard input,
 particularly the ESC key for interrupting agent execution.
 """
 
-import sys
+import os
 import platform
+import select
+import sys
 import threading
+import time
 
 
 class KeyboardListener:
@@ -62,23 +65,27 @@ class KeyboardListener:
                     if self._should_stop:
                         break
 
-                # Read a single character
-                ch = sys.stdin.read(1)
+                # Wait briefly for input so stop() is noticed even when idle
+                ready, _, _ = select.select([fd], [], [], 0.05)
+                if not ready:
+                    continue
 
-                with self._lock:
-                    self._current_key = ch
+                # Read a single byte straight from the fd: a buffered
+                # sys.stdin.read() could swallow the rest of an escape
+                # sequence, hiding it from the follow-up select below
+                ch = os.read(fd, 1).decode(errors="ignore")
 
                 # Check for ESC key (ASCII 27)
                 if ch == '\x1b':
                     # Check if it's ESC followed by something
                     # Common sequences: ESC [ or ESC O
-                    next_char = sys.stdin.read(1)
-                    if next_char:
+                    ready, _, _ = select.select([fd], [], [], 0.01)
+                    if ready:
                         # ESC + character sequence (e.g., ESC [ for cursor keys)
-                        self._current_key = ch + next_char
-                    else:
-                        # Just ESC alone
-                        self._current_key = ch
+                        ch += os.read(fd, 1).decode(errors="ignore")
+
+                with self._lock:
+                    self._current_key = ch
 
         except Exception:
             pass
@@ -100,18 +107,21 @@ class KeyboardListener:
                     if self._should_stop:
                         break
 
-                # Check if there's a key available
-                if msvcrt.kbhit():
-                    ch = msvcrt.getch()
+                # Check if there's a key available; sleep between polls
+                # instead of spinning on kbhit()
+                if not msvcrt.kbhit():
+                    time.sleep(0.01)
+                    continue
 
-                    # Check for ESC (ASCII 27)
-                    if ord(ch) == 27:
-                        # Try to read more characters for sequences
-                        next_char = msvcrt.getch()
-                        if next_char:
-                            self._current_key = ch + next_char
-                        else:
-                            self._current_key = ch
+                ch = msvcrt.getch()
+
+                # Check for ESC (ASCII 27)
+                if ord(ch) == 27:
+                    # Only read a follow-up byte if one is already waiting
+                    if msvcrt.kbhit():
+                        ch += msvcrt.getch()
+                    with self._lock:
+                        self._current_key = ch.decode(errors="ignore")
 
         except Exception:
             pass
@@ -122,10 +132,15 @@ class KeyboardListener:
         Returns:
             True if ESC (or ESC+sequence) was pressed, False otherwise
         """
+        # Lock-free fast path: reading one attribute is atomic under the GIL,
+        # so the common "nothing pressed" poll skips the lock entirely
+        if self._current_key is None:
+            return False
+
         with self._lock:
             key = self._current_key
             self._current_key = None  # Reset after reading
-            return key == '\x1b' or (key and len(key) > 1 and key[0] == '\x1b')
+        return bool(key) and key[0] == '\x1b'
 
     def get_current_key(self) -> str | None:
         """Get the last pressed key.
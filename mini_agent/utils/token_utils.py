@@ -0,0 +1,54 @@
+"""Token counting backend used for context-window estimation.
+
+Prefers nanotok (a faster, tiktoken-compatible BPE implementation) when it is
+installed and falls back to tiktoken's cl100k_base encoding otherwise. The
+encoding is loaded on first use, since tiktoken may need to fetch its BPE file.
+"""
+
+from typing import Any
+
+import tiktoken
+
+_encoding: Any = None
+
+# tiktoken starts a thread pool on every batch call, which costs more than it
+# saves for a handful of texts
+_BATCH_MIN_TEXTS = 32
+
+
+def get_encoding() -> Any:
+    """Return the shared cl100k_base encoding (nanotok if available, else tiktoken)."""
+    global _encoding
+    if _encoding is None:
+        try:
+            from nanotok import Tokenizer
+
+            _encoding = Tokenizer.from_tiktoken("cl100k_base")
+        except Exception:
+            # Not installed, or an incompatible/broken nanotok build
+            _encoding = tiktoken.get_encoding("cl100k_base")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text, treating special-token markers as plain text."""
+    encoding = get_encoding()
+    count = getattr(encoding, "count", None)
+    if count is not None:
+        # Backend can count without materializing the token list
+        return count(text)
+    return len(encoding.encode_ordinary(text))
+
+
+def count_tokens_batch(texts: list[str]) -> list[int]:
+    """Count tokens for several texts, batching through the backend for large lists."""
+    if not texts:
+        return []
+    encoding = get_encoding()
+    count = getattr(encoding, "count", None)
+    if count is not None:
+        return [count(text) for text in texts]
+    if len(texts) < _BATCH_MIN_TEXTS:
+        return [len(encoding.encode_ordinary(text)) for text in texts]
+    encoded = encoding.encode_ordinary_batch(texts, num_threads=min(8, len(texts)))
+    return [len(tokens) for tokens in encoded]
@@ -0,0 +1,36 @@
+"""Tests for async_utils module."""
+
+import sys
+import types
+
+from mini_agent.utils.async_utils import run_async
+
+
+async def _answer():
+    return 42
+
+
+def test_run_async_without_uvloop(monkeypatch):
+    """Test that the default asyncio loop is used when uvloop is missing."""
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+    assert run_async(_answer()) == 42
+
+
+def test_run_async_prefers_uvloop_run(monkeypatch):
+    """Test that uvloop.run is used when available."""
+    calls = []
+
+    def fake_run(coro):
+        calls.append(coro)
+        coro.close()
+        return "uvloop"
+
+    monkeypatch.setitem(sys.modules, "uvloop", types.SimpleNamespace(run=fake_run))
+    assert run_async(_answer()) == "uvloop"
+    assert len(calls) == 1
+
+
+def test_run_async_with_old_uvloop(monkeypatch):
+    """Test falling back to asyncio.run for uvloop releases without run()."""
+    monkeypatch.setitem(sys.modules, "uvloop", types.SimpleNamespace())
+    assert run_async(_answer()) == 42
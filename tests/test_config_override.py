@@ -0,0 +1,179 @@
+"""Test cases for the configuration override system."""
+
+import logging
+import os
+
+import pytest
+
+import mini_agent.config_override as config_override
+from mini_agent.config import Config
+from mini_agent.config_override import ConfigOverride, load_config_with_overrides
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    """Remove any MINI_AGENT_* overrides set in the surrounding environment."""
+    for env_var in ConfigOverride.ENV_VAR_MAPPING:
+        monkeypatch.delenv(env_var, raising=False)
+
+
+def test_env_overrides_only_mapped_vars(monkeypatch):
+    """Test that only mapped, present environment variables are picked up."""
+    monkeypatch.setenv("MINI_AGENT_MODEL", "gpt-4")
+    monkeypatch.setenv("MINI_AGENT_MAX_STEPS", "150")
+    monkeypatch.setenv("MINI_AGENT_UNKNOWN_FIELD", "ignored")
+
+    overrides = ConfigOverride().get_env_overrides()
+
+    assert sorted(overrides) == [(("agent", "max_steps"), 150), (("llm", "model"), "gpt-4")]
+
+
+def test_env_overrides_empty():
+    """Test that no overrides are returned when no mapped vars are set."""
+    assert ConfigOverride().get_env_overrides() == []
+
+
+def test_apply_overrides_does_not_mutate_base(tmp_path):
+    """Test that merging overrides leaves the base config dict untouched."""
+    override_file = tmp_path / "override.yaml"
+    override_file.write_text("llm:\n  retry:\n    max_retries: 5\n")
+
+    base = {
+        "llm": {"model": "base-model", "retry": {"enabled": True, "max_retries": 3}},
+        "agent": {"max_steps": 50},
+    }
+    manager = ConfigOverride()
+    manager.set_cli_override("agent.max_steps", 200)
+
+    result = manager.apply_overrides(base, override_file=override_file)
+
+    assert result["llm"]["retry"] == {"enabled": True, "max_retries": 5}
+    assert result["llm"]["model"] == "base-model"
+    assert result["agent"]["max_steps"] == 200
+    assert base["llm"]["retry"]["max_retries"] == 3
+    assert base["agent"]["max_steps"] == 50
+
+
+def test_env_overrides_type_conversion(monkeypatch):
+    """Test that env values are converted to the field's type."""
+    monkeypatch.setenv("MINI_AGENT_RETRY_ENABLED", "off")
+    monkeypatch.setenv("MINI_AGENT_ENABLE_BASH", "Yes")
+    monkeypatch.setenv("MINI_AGENT_MAX_RETRIES", "7")
+    monkeypatch.setenv("MINI_AGENT_INITIAL_DELAY", "2")
+
+    overrides = dict(ConfigOverride().get_env_overrides())
+
+    assert overrides[("llm", "retry", "enabled")] is False
+    assert overrides[("tools", "enable_bash")] is True
+    assert overrides[("llm", "retry", "max_retries")] == 7
+    assert overrides[("llm", "retry", "initial_delay")] == 2.0
+    assert isinstance(overrides[("llm", "retry", "initial_delay")], float)
+
+
+def test_env_overrides_numeric_edge_cases(monkeypatch):
+    """Test that "5.0" is accepted for int fields and bad values name their variable."""
+    monkeypatch.setenv("MINI_AGENT_MAX_RETRIES", "5.0")
+    assert dict(ConfigOverride().get_env_overrides())[("llm", "retry", "max_retries")] == 5.0
+
+    monkeypatch.setenv("MINI_AGENT_MAX_RETRIES", "five")
+    with pytest.raises(ValueError, match="MINI_AGENT_MAX_RETRIES"):
+        ConfigOverride().get_env_overrides()
+
+
+def test_file_overrides_reparsed_after_change(tmp_path):
+    """Test that cached override files are re-read once modified."""
+    override_file = tmp_path / "override.yaml"
+    override_file.write_text("agent:\n  max_steps: 10\n")
+    manager = ConfigOverride()
+
+    assert manager.get_file_overrides(override_file) == {"agent": {"max_steps": 10}}
+    assert manager.get_file_overrides(override_file) == {"agent": {"max_steps": 10}}
+
+    # Rewrite within the same timestamp tick: the size change alone must invalidate
+    stat = override_file.stat()
+    override_file.write_text("agent:\n  max_steps: 200\n")
+    os.utime(override_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert manager.get_file_overrides(override_file) == {"agent": {"max_steps": 200}}
+    assert manager.get_file_overrides(tmp_path / "missing.yaml") == {}
+
+
+def test_cached_file_overrides_not_shared_with_results(tmp_path):
+    """Test that mutating a merged result does not leak into later file loads."""
+    override_file = tmp_path / "override.yaml"
+    override_file.write_text("tools:\n  enable_mcp: false\n")
+    manager = ConfigOverride()
+
+    result = manager.apply_overrides({"llm": {}}, override_file)
+    result["tools"]["enable_mcp"] = True
+    manager.get_file_overrides(override_file)["tools"]["extra"] = 1
+
+    assert manager.get_file_overrides(override_file) == {"tools": {"enable_mcp": False}}
+
+
+def test_load_config_with_overrides(monkeypatch, tmp_path):
+    """Test loading the base YAML config and validating it with overrides applied."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("api_key: test-key\nmodel: base-model\nmax_steps: 30\n")
+    monkeypatch.setattr(Config, "get_default_config_path", classmethod(lambda cls: config_file))
+    monkeypatch.setenv("MINI_AGENT_MAX_RETRIES", "9")
+
+    config = load_config_with_overrides(
+        override_file=tmp_path / "missing.yaml",
+        cli_args={"llm.model": "cli-model"},
+    )
+
+    assert config.llm.api_key == "test-key"
+    assert config.llm.model == "cli-model"
+    assert config.llm.retry.max_retries == 9
+    assert config.agent.max_steps == 30
+    assert config.tools.mcp.connect_timeout == 10.0
+    assert config.tools == Config.from_yaml(config_file).tools
+
+
+def test_apply_overrides_without_overrides_returns_base(tmp_path):
+    """Test that the merge is skipped entirely when nothing is overridden."""
+    base = {"agent": {"max_steps": 50}}
+
+    result = ConfigOverride().apply_overrides(base, override_file=tmp_path / "missing.yaml")
+
+    assert result is base
+
+
+def test_verbose_tracks_override_sources(monkeypatch, tmp_path):
+    """Test that verbose mode records where each overridden leaf came from."""
+    monkeypatch.setenv("MINI_AGENT_MAX_STEPS", "80")
+    override_file = tmp_path / "override.yaml"
+    override_file.write_text("llm:\n  model: file-model\n  retry:\n    max_retries: 5\n")
+
+    manager = ConfigOverride(verbose=True)
+    manager.set_cli_override("llm.model", "cli-model")
+    manager.apply_overrides({"llm": {}, "agent": {}}, override_file=override_file)
+
+    assert manager.overrides["llm.retry.max_retries"].source == "override_yaml"
+    assert manager.overrides["agent.max_steps"].source == "env"
+    assert manager.overrides["llm.model"].source == "cli"
+    assert manager.overrides["llm.model"].value == "cli-model"
+
+
+def test_unknown_env_vars_logged_once(monkeypatch, caplog):
+    """Test that unmapped MINI_AGENT_* variables are reported once at debug level."""
+    monkeypatch.setattr(config_override, "_unknown_env_reported", False)
+    monkeypatch.setenv("MINI_AGENT_NOT_A_FIELD", "1")
+
+    with caplog.at_level(logging.DEBUG, logger="mini_agent.config_override"):
+        ConfigOverride().get_env_overrides()
+        ConfigOverride().get_env_overrides()
+
+    messages = [r.getMessage() for r in caplog.records if "MINI_AGENT_NOT_A_FIELD" in r.getMessage()]
+    assert len(messages) == 1
+
+
+def test_prompt_caching_read_from_config(tmp_path):
+    """Test that llm.prompt_caching defaults to off and is read from YAML."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("api_key: test-key\n")
+    assert Config.from_yaml(config_file).llm.prompt_caching is False
+
+    config_file.write_text("api_key: test-key\nprompt_caching: true\n")
+    assert Config.from_yaml(config_file).llm.prompt_caching is True
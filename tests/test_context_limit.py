@@ -0,0 +1,240 @@
+"""Test cases for LLMClientBase.enforce_context_limit."""
+
+import pytest
+
+import mini_agent.utils.token_utils as tokenizer
+from mini_agent.llm.base import LLMClientBase
+from mini_agent.schema import Message
+
+
+class _WordEncoding:
+    """Offline stand-in for tiktoken: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.calls += 1
+        return text.split()
+
+    def encode_ordinary(self, text):
+        return self.encode(text)
+
+    def encode_ordinary_batch(self, texts, num_threads=8):
+        return [self.encode(text) for text in texts]
+
+
+class _DummyClient(LLMClientBase):
+    async def generate(self, messages, tools=None):
+        raise NotImplementedError
+
+    def _prepare_request(self, messages, tools=None):
+        raise NotImplementedError
+
+    def _convert_messages(self, messages):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    enc = _WordEncoding()
+    monkeypatch.setattr(tokenizer, "_encoding", enc)
+    return enc
+
+
+@pytest.fixture
+def client():
+    return _DummyClient(api_key="test", api_base="http://localhost", model="test")
+
+
+def test_under_limit_keeps_messages(client, encoding):
+    """Test that messages under the limit are returned unchanged."""
+    messages = [
+        Message(role="system", content="You are a helpful assistant."),
+        Message(role="user", content="Hello there"),
+    ]
+
+    result = client.enforce_context_limit(messages, model_context_limit=4096, safety_margin=0)
+
+    assert result is messages
+
+
+def test_long_message_truncated_without_mutating_input(client, encoding):
+    """Test that an oversized message is replaced by a truncated copy."""
+    long_text = "\n".join(f"line {i} " + "word " * 20 for i in range(100))
+    messages = [
+        Message(role="system", content="system prompt"),
+        Message(role="user", content=long_text),
+    ]
+
+    result = client.enforce_context_limit(messages, model_context_limit=1024, safety_margin=0)
+
+    assert result is not messages
+    assert result[0] is messages[0]
+    assert "Content truncated" in result[1].content
+    assert messages[1].content == long_text
+
+
+def test_over_limit_prunes_oldest_and_adds_summary(client, encoding):
+    """Test that old messages are pruned and summarized when over the limit."""
+    filler = "word " * 300
+    messages = [Message(role="system", content="system prompt")]
+    messages.append(Message(role="user", content="first instruction"))
+    for i in range(10):
+        messages.append(Message(role="assistant", content=f"step {i} {filler}"))
+        messages.append(Message(role="tool", content=f"result {i}", tool_call_id=f"call_{i}"))
+    messages.append(Message(role="user", content="last instruction"))
+
+    result = client.enforce_context_limit(messages, model_context_limit=1024, safety_margin=0)
+
+    contents = [m.content for m in result]
+    assert contents[0] == "system prompt"
+    assert result[1].role == "system"
+    assert result[1].content.startswith("Conversation summary (truncated):")
+    assert "first instruction" in contents
+    assert "last instruction" in contents
+    assert len(result) < len(messages)
+    # Original messages are never modified
+    assert messages[2].content == f"step 0 {filler}"
+    # Each message is tokenized a bounded number of times, not once per pass
+    assert encoding.calls <= len(messages) + 1
+
+
+def test_well_under_limit_skips_tokenizer(client, encoding):
+    """Test that small conversations are accepted without any tokenizer call."""
+    messages = [
+        Message(role="system", content="You are a helpful assistant."),
+        Message(role="user", content="Hello there"),
+    ]
+
+    client.enforce_context_limit(messages, model_context_limit=4096, safety_margin=0)
+
+    assert encoding.calls == 0
+
+
+def test_token_upper_bound_uses_utf8_size():
+    """Test that the tokenizer-free bound counts characters for ASCII and bytes otherwise."""
+    assert LLMClientBase._token_upper_bound("abcd" * 10) == 40
+    assert LLMClientBase._token_upper_bound("你好世界" * 10) == 120
+
+
+def test_dense_text_near_limit_is_tokenized(client, encoding):
+    """Test that token-dense output is not waved through by a chars-per-token guess."""
+    messages = [
+        Message(role="system", content="system prompt"),
+        Message(role="tool", content="1 " * 20000, tool_call_id="call_1"),
+    ]
+
+    result = client.enforce_context_limit(messages, model_context_limit=16512, safety_margin=512)
+
+    assert result is not messages
+    assert encoding.calls > 0
+
+
+def test_single_message_and_no_stdout(client, encoding, capsys):
+    """Test that short histories are accepted and nothing is printed."""
+    messages = [Message(role="system", content="You are a helpful assistant.")]
+
+    result = client.enforce_context_limit(messages, model_context_limit=4096, safety_margin=0)
+
+    assert len(result) == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_over_limit_without_user_messages(client, encoding):
+    """Test that pruning works when the history has no user messages."""
+    filler = "word " * 300
+    messages = [Message(role="system", content="system prompt")]
+    messages += [Message(role="assistant", content=f"step {i} {filler}") for i in range(10)]
+
+    result = client.enforce_context_limit(messages, model_context_limit=1024, safety_margin=0)
+
+    assert result[0].content == "system prompt"
+    assert result[-1] is messages[-1]
+    assert len(result) < len(messages)
+
+
+def test_summary_keeps_most_recent_removed_excerpts(client, encoding):
+    """Test that the summary only quotes the most recently pruned messages."""
+    filler = "word " * 100
+    messages = [Message(role="system", content="system prompt")]
+    messages += [Message(role="assistant", content=f"step-{i} {filler}") for i in range(40)]
+
+    result = client.enforce_context_limit(messages, model_context_limit=1024, safety_margin=0)
+
+    summary = result[1].content
+    assert summary.startswith("Conversation summary (truncated):")
+    assert "step-0 " not in summary
+    assert summary.count("[assistant]") <= 20
+
+
+def test_message_text_is_cached_until_fields_change():
+    """Test that flattened message text is reused and refreshed on reassignment."""
+    from mini_agent.schema import FunctionCall, ToolCall
+
+    msg = Message(
+        role="assistant",
+        content="calling a tool",
+        tool_calls=[ToolCall(id="c1", type="function", function=FunctionCall(name="read", arguments={"path": "a"}))],
+    )
+
+    first = LLMClientBase._message_text(msg)
+    assert LLMClientBase._message_text(msg) is first
+    assert '"path"' in first and '"read"' in first
+
+    msg.content = "updated"
+    assert LLMClientBase._message_text(msg).startswith("assistant\nupdated")
+
+
+def test_json_dumps_falls_back_to_stdlib(monkeypatch):
+    """Test that structured content serializes the same way with or without orjson."""
+    import json
+
+    import mini_agent.llm.base as base
+
+    payload = [{"type": "text", "text": "héllo"}]
+    monkeypatch.setattr(base, "orjson", None)
+    assert base._json_dumps(payload) == json.dumps(payload, ensure_ascii=False)
+    assert json.loads(base._json_dumps(payload)) == payload
+
+
+def test_many_short_messages_are_counted_with_roles(client, encoding):
+    """Test that many short messages are not waved through on content length alone."""
+    messages = [Message(role="user", content="ok") for _ in range(3000)]
+
+    result = client.enforce_context_limit(messages, model_context_limit=5000, safety_margin=0)
+
+    assert result is not messages
+    assert len(result) < len(messages)
+
+
+def test_broken_nanotok_falls_back_to_tiktoken(monkeypatch):
+    """Test that an unusable nanotok install does not break token counting."""
+    import sys
+    import types
+
+    sentinel = _WordEncoding()
+    monkeypatch.setitem(sys.modules, "nanotok", types.SimpleNamespace(Tokenizer=object()))
+    monkeypatch.setattr(tokenizer.tiktoken, "get_encoding", lambda name: sentinel)
+    monkeypatch.setattr(tokenizer, "_encoding", None)
+
+    assert tokenizer.get_encoding() is sentinel
+    assert tokenizer.count_tokens("two words") == 2
+
+
+def test_count_tokens_batch_only_batches_large_lists(encoding, monkeypatch):
+    """Test that short lists are counted one by one instead of via the threaded batch call."""
+    batched = []
+
+    def encode_ordinary_batch(texts, num_threads=8):
+        batched.append(texts)
+        return [text.split() for text in texts]
+
+    monkeypatch.setattr(encoding, "encode_ordinary_batch", encode_ordinary_batch)
+
+    assert tokenizer.count_tokens_batch(["one two", "three"]) == [2, 1]
+    assert batched == []
+
+    texts = ["a b"] * tokenizer._BATCH_MIN_TEXTS
+    assert tokenizer.count_tokens_batch(texts) == [2] * len(texts)
+    assert batched == [texts]
@@ -1,4 +1,6 @@
-from mini_agent.tools.context_selector import ContextSelector
+import pytest
+
+from mini_agent.tools.context_selector import ContextItem, ContextSelector
 
 
 def test_selects_relevant_document():
@@ -28,3 +30,60 @@ def test_respects_token_budget():
     # should include truncated version (not exceed budget)
     total_tokens = sum(it["est_tokens"] for it in selected)
     assert total_tokens <= 10
+
+
+def test_lexical_score_is_case_insensitive():
+    selector = ContextSelector()
+    item = ContextItem(source="document", text="File SAVE Error occurred", metadata={})
+    assert selector.score_item(item, "file save error") == 0.7
+    assert selector.score_item(item, "FILE missing") == pytest.approx(0.35)
+    assert selector.score_item(item, "") == 0.0
+
+
+def test_ranking_order_and_ties():
+    selector = ContextSelector()
+    docs = [
+        {"text": "payments endpoint notes", "id": "low"},
+        {"text": "error in file save path", "id": "long"},
+        {"text": "file save error", "id": "short"},
+        {"text": "save error", "id": "partial"},
+    ]
+    selected = selector.select_context(query="file save error", documents=docs, token_budget=1000)
+    assert [it["metadata"]["id"] for it in selected] == ["short", "long", "partial", "low"]
+
+
+def test_estimate_counts_words_across_any_whitespace():
+    selector = ContextSelector()
+    assert selector._estimate_tokens("one\ttwo\nthree four") == 4
+    log = "\n".join(f"2024-01-01 line-{i}" for i in range(5000))
+    assert selector._estimate_tokens(log) == 10000
+    selected = selector.select_context(query="line-1", documents=[log], token_budget=10)
+    assert sum(it["est_tokens"] for it in selected) <= 10
+
+
+def test_truncation_by_words_stays_within_budget():
+    selector = ContextSelector()
+    docs = [{"text": "a\tbb\nccc dddd\n" * 200, "ts": 9999999999}]
+    selected = selector.select_context(query="a bb ccc dddd", documents=docs, token_budget=7)
+    assert len(selected) == 1
+    assert selected[0]["text"] == "a\tbb\nccc dddd\na\tbb\nccc"
+    assert selected[0]["est_tokens"] == 7
+
+
+def test_stops_once_budget_is_filled(monkeypatch):
+    selector = ContextSelector()
+    docs = [{"text": "word " * 50, "id": f"d{i}"} for i in range(5)]
+    estimated = []
+    original = selector._estimate_tokens
+
+    def counting_estimate(text):
+        estimated.append(text)
+        return original(text)
+
+    monkeypatch.setattr(selector, "_estimate_tokens", counting_estimate)
+    selected = selector.select_context(query="word", documents=docs, token_budget=20)
+
+    assert len(selected) == 1
+    assert selected[0]["est_tokens"] == 20
+    # the first (truncated) item fills the budget; later items are never visited
+    assert len(estimated) == 2
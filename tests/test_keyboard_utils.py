@@ -82,6 +82,20 @@ class TestKeyboardUtils:
         assert result == True
         print("✓ ESC key detection works")
 
+    @staticmethod
+    def test_non_esc_key_not_detected():
+        """Test that other keys are consumed without reporting ESC."""
+        print("\n5b. Testing non-ESC key handling...")
+        listener = KeyboardListener()
+
+        with listener._lock:
+            listener._current_key = 'a'
+
+        assert listener.is_esc_pressed() is False
+        assert listener._current_key is None
+        assert listener.is_esc_pressed() is False
+        print("✓ Non-ESC keys are ignored")
+
     @staticmethod
     async def test_esc_press_in_async():
         """Test ESC key detection in async context."""
@@ -133,6 +147,7 @@ class TestKeyboardUtils:
             test_is_esc_pressed_no_key,
             test_global_listener,
             test_esc_press_detection,
+            test_non_esc_key_not_detected,
             test_esc_press_in_async,
             test_keyboard_listener_cleanup,
         ]
@@ -10,7 +10,7 @@ from pathlib import Path
 import pytest
 import yaml
 
-from mini_agent.llm import AnthropicClient, OpenAIClient
+from mini_agent.llm import AnthropicClient, LLMClient, OpenAIClient
 from mini_agent.retry import RetryConfig
 from mini_agent.schema import Message
 
@@ -22,6 +22,53 @@ def load_config():
         return yaml.safe_load(f)
 
 
+class _RecordingMessages:
+    """Stands in for `AsyncAnthropic.messages`, capturing request params."""
+
+    def __init__(self):
+        self.params = None
+
+    async def create(self, **params):
+        self.params = params
+        return "response"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "prompt_caching, expected_system",
+    [
+        (False, "You are a helpful assistant."),
+        (
+            True,
+            [
+                {
+                    "type": "text",
+                    "text": "You are a helpful assistant.",
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        ),
+    ],
+)
+async def test_anthropic_system_prompt_caching_flag(prompt_caching, expected_system):
+    """Test that cache_control is only sent when prompt caching is enabled."""
+    client = AnthropicClient(api_key="test-key", prompt_caching=prompt_caching)
+    recorder = _RecordingMessages()
+    client.client.messages = recorder
+
+    api_messages = [{"role": "user", "content": "Hi"}]
+    await client._make_api_request("You are a helpful assistant.", api_messages)
+
+    assert recorder.params["system"] == expected_system
+    assert recorder.params["messages"] == api_messages
+
+
+def test_llm_client_forwards_prompt_caching():
+    """Test that LLMClient passes the prompt caching flag to the Anthropic client."""
+    assert LLMClient(api_key="test-key", prompt_caching=True)._client.prompt_caching is True
+    assert LLMClient(api_key="test-key")._client.prompt_caching is False
+
+
 @pytest.mark.asyncio
 async def test_anthropic_simple_completion():
     """Test Anthropic client with simple completion."""